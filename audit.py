@@ -1,17 +1,33 @@
 """SQLite-backed audit logger for MCP tool invocations."""
 
+import asyncio
 import json
 import logging
+import math
+import sqlite3
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
+from pathlib import Path
 
 import aiosqlite
 
+from jsonutil import dumps
+
 logger = logging.getLogger(__name__)
 
-_SCHEMA = """
+# Bump when the tool_calls layout changes — _migrate() rebuilds older tables.
+_SCHEMA_VERSION = 5
+
+# STRICT skips type-affinity coercion on insert (SQLite 3.37+)
+_STRICT = " STRICT" if sqlite3.sqlite_version_info >= (3, 37) else ""
+
+# Plain INTEGER PRIMARY KEY (rowid alias) — AUTOINCREMENT would add a
+# sqlite_sequence write to every insert
+_SCHEMA = f"""
 CREATE TABLE IF NOT EXISTS tool_calls (
-    id              INTEGER PRIMARY KEY AUTOINCREMENT,
-    timestamp       TEXT    NOT NULL,
+    id              INTEGER PRIMARY KEY,
+    timestamp_ms    INTEGER NOT NULL,
     request_id      TEXT,
     session_id      TEXT,
     client_name     TEXT,
@@ -20,28 +36,353 @@ CREATE TABLE IF NOT EXISTS tool_calls (
     parameters      TEXT,
     success         INTEGER NOT NULL,
     error_msg       TEXT,
-    duration_ms     REAL    NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_timestamp  ON tool_calls (timestamp);
-CREATE INDEX IF NOT EXISTS idx_session_id ON tool_calls (session_id);
-CREATE INDEX IF NOT EXISTS idx_tool_name  ON tool_calls (tool_name);
-CREATE INDEX IF NOT EXISTS idx_client     ON tool_calls (client_name);
+    duration_us     INTEGER NOT NULL
+){_STRICT};
+CREATE INDEX IF NOT EXISTS idx_ts_ms      ON tool_calls (timestamp_ms);
+-- session_id filters come from the dashboard's session view, ordered newest first
+CREATE INDEX IF NOT EXISTS idx_session_recent ON tool_calls (session_id, id DESC);
+-- client_name has a handful of distinct values — an index costs more on insert
+-- than it saves on the rare client filter
+DROP INDEX IF EXISTS idx_session_id;
+DROP INDEX IF EXISTS idx_client;
+-- Covers the listing columns so per-tool listings are index-only scans
+-- (supersedes the old single-column idx_tool_name)
+CREATE INDEX IF NOT EXISTS idx_recent_cover ON tool_calls
+    (tool_name, id DESC, timestamp_ms, success, duration_us, session_id, client_name);
+DROP INDEX IF EXISTS idx_tool_name;
+-- errors_only listings: failures are rare, so a partial index stays tiny and spares
+-- a newest-first scan over every successful call
+CREATE INDEX IF NOT EXISTS idx_errors_recent ON tool_calls (id DESC) WHERE success = 0;
+
+-- Rolling aggregates, updated in the same transaction as each batch of inserts
+-- so get_summary_stats never has to scan tool_calls
+CREATE TABLE IF NOT EXISTS tool_stats (
+    tool_name       TEXT    PRIMARY KEY,
+    calls           INTEGER NOT NULL,
+    errors          INTEGER NOT NULL,
+    sum_dur_us      INTEGER NOT NULL,
+    sum_sq_dur_ms   REAL    NOT NULL,   -- sum of squared durations (ms²) for stddev
+    max_dur_us      INTEGER NOT NULL,
+    first_ts        INTEGER NOT NULL,
+    last_ts         INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS seen_clients  (client_name TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS seen_sessions (session_id  TEXT PRIMARY KEY) WITHOUT ROWID;
+"""
+
+# Recompute the aggregate tables from tool_calls (run after a schema migration; calls that
+# were only counted, not sampled into tool_calls, are lost from the totals)
+_BACKFILL_STATS = """
+DELETE FROM tool_stats;
+INSERT INTO tool_stats
+SELECT tool_name, COUNT(*), SUM(success = 0), SUM(duration_us),
+       SUM((duration_us / 1000.0) * (duration_us / 1000.0)), MAX(duration_us),
+       MIN(timestamp_ms), MAX(timestamp_ms)
+FROM tool_calls GROUP BY tool_name;
+INSERT OR IGNORE INTO seen_clients
+SELECT DISTINCT client_name FROM tool_calls WHERE client_name IS NOT NULL;
+INSERT OR IGNORE INTO seen_sessions
+SELECT DISTINCT session_id FROM tool_calls WHERE session_id IS NOT NULL;
 """
 
+_COLUMNS = (
+    "id", "timestamp_ms", "request_id", "session_id", "client_name", "client_version",
+    "tool_name", "parameters", "success", "error_msg", "duration_us",
+)
+
+# Columns returned by the listing queries — all served by idx_recent_cover.
+# Use get_call() for the full row (parameters, error_msg, request/client details).
+_LIST_COLUMNS = (
+    "id", "timestamp_ms", "tool_name", "success", "duration_us", "session_id", "client_name",
+)
+_LIST_SELECT = ", ".join(_LIST_COLUMNS)
+
+# Listing queries return at most this many rows, whatever the caller asks for
+_MAX_LIMIT = 500
+
+# Column order of the rows _write_batch inserts (id is assigned by SQLite)
+_INSERT_SQL = (
+    f"INSERT INTO tool_calls ({', '.join(_COLUMNS[1:])}) "
+    f"VALUES ({', '.join('?' * len(_COLUMNS[1:]))})"
+)
+
+_UPSERT_STATS_SQL = """
+INSERT INTO tool_stats
+    (tool_name, calls, errors, sum_dur_us, sum_sq_dur_ms, max_dur_us, first_ts, last_ts)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (tool_name) DO UPDATE SET
+    calls         = calls + excluded.calls,
+    errors        = errors + excluded.errors,
+    sum_dur_us    = sum_dur_us + excluded.sum_dur_us,
+    sum_sq_dur_ms = sum_sq_dur_ms + excluded.sum_sq_dur_ms,
+    max_dur_us    = MAX(max_dur_us, excluded.max_dur_us),
+    last_ts       = MAX(last_ts, excluded.last_ts)
+"""
+
+# How to derive current columns from tables written by older schema versions
+_LEGACY_COLUMNS = {
+    "timestamp_ms": "CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER)",
+    "duration_us": "CAST(ROUND(duration_ms * 1000) AS INTEGER)",
+}
+
+
+def _params_json(parameters: dict | None) -> str | None:
+    """Serialize tool arguments for the ``parameters`` column. Never raises.
+
+    orjson rejects some values stdlib json accepts (e.g. ints beyond 64 bits); those
+    fall back to ``json.dumps`` with ``str()`` for anything unserializable, then ``repr``.
+    """
+    if not parameters:
+        return None
+    try:
+        return dumps(parameters)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return json.dumps(parameters, default=str)
+    except (TypeError, ValueError):
+        return repr(parameters)
+
+
+def _clamp_limit(limit: int) -> int:
+    return max(1, min(limit, _MAX_LIMIT))
+
+
+def _to_ms(value: str) -> int:
+    """Convert an ISO 8601 date/datetime (naive = UTC) to epoch milliseconds.
+
+    Accepts ``YYYY-MM-DD`` or ``YYYY-MM-DDTHH:MM[:SS[.fff[fff]]]`` with an optional
+    ``Z`` or ``±HH:MM`` offset — what ``datetime.fromisoformat`` takes on Python 3.10
+    (runtime.txt). Raises ``ValueError`` for anything else.
+    """
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(
+            f"Invalid date/time {value!r} — use ISO 8601, e.g. 2026-02-01 or 2026-02-01T09:30:00Z"
+        ) from None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def _to_iso(ms: int | None) -> str | None:
+    """Format epoch milliseconds as an ISO 8601 UTC string."""
+    if ms is None:
+        return None
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _client_meta(ctx) -> tuple[str | None, str | None, str | None, str | None]:
+    """Extract (request_id, session_id, client_name, client_version) from an MCP Context.
+
+    Each lookup degrades to None independently — the context may be missing,
+    partially populated, or from a session that has since closed.
+    """
+    request_id = session_id = client_name = client_version = None
+    if ctx is None:
+        return request_id, session_id, client_name, client_version
+    # Session ID from the MCP session
+    try:
+        session_id = ctx.session.client_params.meta.sessionId
+    except Exception:
+        pass
+    # Client info from MCP handshake
+    try:
+        client_info = ctx.session.client_params.clientInfo
+        client_name = client_info.name
+        client_version = client_info.version
+    except Exception:
+        pass
+    # Request ID from the JSON-RPC message
+    try:
+        request_id = str(ctx.request_id)
+    except Exception:
+        pass
+    return request_id, session_id, client_name, client_version
+
+
+def _recent_query(limit: int) -> tuple[str, tuple]:
+    return (
+        f"SELECT {_LIST_SELECT} FROM tool_calls ORDER BY id DESC LIMIT ?",
+        (_clamp_limit(limit),),
+    )
+
+
+def _filtered_query(
+    *,
+    tool_name: str | None = None,
+    session_id: str | None = None,
+    client_name: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    errors_only: bool = False,
+    limit: int = 100,
+) -> tuple[str, tuple]:
+    """Build the listing SQL and parameters for ``query_with_filters``."""
+    clauses: list[str] = []
+    params: list[str | int] = []
+
+    if tool_name:
+        clauses.append("tool_name = ?")
+        params.append(tool_name)
+    if session_id:
+        clauses.append("session_id = ?")
+        params.append(session_id)
+    if client_name:
+        clauses.append("client_name = ?")
+        params.append(client_name)
+    if since:
+        clauses.append("timestamp_ms >= ?")
+        params.append(_to_ms(since))
+    if until:
+        clauses.append("timestamp_ms <= ?")
+        params.append(_to_ms(until))
+    if errors_only:
+        clauses.append("success = 0")
+
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    params.append(_clamp_limit(limit))
+    return (
+        f"SELECT {_LIST_SELECT} FROM tool_calls{where} ORDER BY id DESC LIMIT ?",
+        tuple(params),
+    )
+
 
 class AuditLogger:
-    """Async SQLite audit logger — records every MCP tool invocation."""
+    """Async SQLite audit logger — records every MCP tool invocation.
+
+    Writes are queued and committed in batches by a single background task, so
+    tool calls never wait on SQLite (or its fsync) to return.
+    """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        enabled: bool = True,
+        queue_max: int = 10_000,
+        batch_max: int = 512,
+        commit_delay_ms: float = 2.0,
+        commit_siblings: int = 4,
+        cache_size_kib: int = 65536,
+        mmap_size: int = 268435456,
+        checkpoint_batches: int = 64,
+        checkpoint_idle_s: float = 5.0,
+        optimize_interval_s: float = 3600.0,
+    ) -> None:
+        self.enabled = enabled
         self._db_path = db_path
         self._db: aiosqlite.Connection | None = None
+        self._batch_max = batch_max
+        self._commit_delay = commit_delay_ms / 1000
+        self._commit_siblings = commit_siblings
+        self._cache_size_kib = cache_size_kib
+        self._mmap_size = mmap_size
+        self._checkpoint_batches = checkpoint_batches
+        self._checkpoint_idle = checkpoint_idle_s
+        self._optimize_interval = optimize_interval_s
+        self._batches_since_checkpoint = 0
+        self._wal_dirty = False
+        self._next_optimize = 0.0
+        # Bounded so a stalled disk sheds audit records instead of growing memory
+        self._queue: asyncio.Queue[tuple | None] = asyncio.Queue(maxsize=queue_max)
+        self.dropped = 0
+        # Successful calls skipped by sampling, as tool_stats rows keyed by tool name;
+        # the writer folds them in with its next batch
+        self._unsampled: dict[str, list] = {}
+        self._writer_task: asyncio.Task | None = None
+        # Serializes initialize() — concurrent first reads must not open two connections
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self) -> None:
-        self._db = await aiosqlite.connect(self._db_path)
-        await self._db.execute("PRAGMA journal_mode=WAL")
-        await self._db.execute("PRAGMA synchronous=NORMAL")
-        await self._db.executescript(_SCHEMA)
-        await self._db.commit()
+        """Open the DB and, when enabled, migrate it and start the writer.
+
+        Idempotent and safe to call concurrently. A disabled logger never starts
+        the writer: it opens an existing file read-only (migrating it once first if
+        it has an older schema), and with no file at all it serves empty results
+        from an in-memory schema instead of creating one.
+        """
+        async with self._init_lock:
+            if self._db is not None:
+                return
+            if self.enabled:
+                db = await aiosqlite.connect(self._db_path)
+            elif not Path(self._db_path).exists():
+                # e.g. a fresh CF disk — nothing has been recorded to read
+                db = await aiosqlite.connect(":memory:")
+                await db.executescript(_SCHEMA)
+            else:
+                db = await self._connect_readonly()
+            try:
+                await db.executescript(
+                    f"""
+                    PRAGMA temp_store=MEMORY;
+                    PRAGMA cache_size=-{int(self._cache_size_kib)};
+                    PRAGMA mmap_size={int(self._mmap_size)};
+                    PRAGMA busy_timeout=5000;
+                    """
+                )
+                if self.enabled:
+                    await db.executescript(
+                        """
+                        PRAGMA journal_mode=WAL;
+                        PRAGMA synchronous=NORMAL;
+                        PRAGMA wal_autocheckpoint=1000;
+                        """
+                    )
+                    await self._migrate(db)
+                    await db.executescript(_SCHEMA)
+                    await db.commit()
+            except BaseException:
+                await db.close()
+                raise
+            self._db = db
+            if self.enabled:
+                self._next_optimize = time.monotonic() + self._optimize_interval
+                self._writer_task = asyncio.create_task(self._writer())
+
+    async def _connect_readonly(self) -> aiosqlite.Connection:
+        """Open the existing DB read-only, after bringing an older schema up to date."""
+        db = await aiosqlite.connect(self._db_path)
+        try:
+            cur = await db.execute("PRAGMA user_version")
+            (version,) = await cur.fetchone()
+            if version < _SCHEMA_VERSION:
+                await self._migrate(db)
+                await db.executescript(_SCHEMA)
+                await db.commit()
+        finally:
+            await db.close()
+        return await aiosqlite.connect(
+            Path(self._db_path).resolve().as_uri() + "?mode=ro", uri=True
+        )
+
+    async def _migrate(self, db: aiosqlite.Connection) -> None:
+        """Rebuild a ``tool_calls`` table from an older schema version, keeping its rows."""
+        cur = await db.execute("PRAGMA user_version")
+        (version,) = await cur.fetchone()
+        if version >= _SCHEMA_VERSION:
+            return
+
+        cur = await db.execute("PRAGMA table_info(tool_calls)")
+        old_columns = {row[1] for row in await cur.fetchall()}
+        script = f"PRAGMA user_version = {_SCHEMA_VERSION};"
+        if old_columns:
+            select = ", ".join(c if c in old_columns else _LEGACY_COLUMNS[c] for c in _COLUMNS)
+            script = f"""
+                BEGIN;
+                ALTER TABLE tool_calls RENAME TO tool_calls_old;
+                DROP TABLE IF EXISTS tool_stats;
+                {_SCHEMA}
+                INSERT INTO tool_calls ({", ".join(_COLUMNS)}) SELECT {select} FROM tool_calls_old;
+                DROP TABLE tool_calls_old;
+                {_BACKFILL_STATS}
+                {script}
+                COMMIT;
+            """
+            logger.info("Migrating audit table from schema v%d to v%d", version, _SCHEMA_VERSION)
+        await db.executescript(script)
 
     async def _ensure_db(self) -> None:
         """Lazily initialize the DB connection on first use."""
@@ -49,9 +390,40 @@ class AuditLogger:
             await self.initialize()
 
     async def close(self) -> None:
-        if self._db:
-            await self._db.close()
-            self._db = None
+        """Flush any queued records, stop the writer, and close the connection.
+
+        If the writer has already died, whatever is still queued is discarded
+        (there is nothing left to drain it) and the connection is closed anyway.
+        """
+        try:
+            if self._writer_task:
+                task, self._writer_task = self._writer_task, None
+                if task.done():
+                    discarded = 0
+                    while not self._queue.empty():
+                        if self._queue.get_nowait() is not None:
+                            discarded += 1
+                    if not task.cancelled() and task.exception() is not None:
+                        logger.error(
+                            "Audit writer had stopped (%d queued records discarded)",
+                            discarded,
+                            exc_info=task.exception(),
+                        )
+                else:
+                    await self._queue.put(None)  # sentinel — writer exits once drained
+                    try:
+                        await task
+                    except Exception:
+                        logger.exception("Audit writer failed while draining")
+        finally:
+            if self._db:
+                if self.enabled:  # a disabled logger's connection is read-only
+                    try:
+                        await self._db.execute("PRAGMA optimize")  # refresh planner stats
+                    except Exception:
+                        logger.exception("PRAGMA optimize failed on close")
+                await self._db.close()
+                self._db = None
 
     # ------------------------------------------------------------------
     # Write
@@ -64,56 +436,241 @@ class AuditLogger:
         parameters: dict | None = None,
         success: bool,
         error_msg: str | None = None,
-        duration_ms: float,
-        request_id: str | None = None,
-        session_id: str | None = None,
-        client_name: str | None = None,
-        client_version: str | None = None,
+        duration_us: int,
+        ctx=None,
     ) -> None:
-        """Insert an audit record. Never raises — failures are logged and swallowed."""
+        """Queue an audit record for the background writer. Never raises.
+
+        ``ctx`` is the tool call's MCP Context (or None). Its session/client
+        metadata and the parameter JSON are resolved later by the writer, so the
+        caller only pays for a tuple and a queue put.
+        """
+        if not self.enabled:
+            return
         try:
-            await self._ensure_db()
-            await self._db.execute(
-                """
-                INSERT INTO tool_calls
-                    (timestamp, request_id, session_id, client_name, client_version,
-                     tool_name, parameters, success, error_msg, duration_ms)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            # Normally a lifespan (app_lifespan or, over stdio, mcp_lifespan) has
+            # already started the writer; otherwise start it on the first record
+            if self._writer_task is None:
+                await self._ensure_db()
+            self._queue.put_nowait(
                 (
-                    datetime.now(timezone.utc).isoformat(),
-                    request_id,
-                    session_id,
-                    client_name,
-                    client_version,
+                    int(time.time() * 1000),
                     tool_name,
-                    json.dumps(parameters) if parameters else None,
+                    parameters,
                     1 if success else 0,
                     error_msg,
-                    duration_ms,
-                ),
+                    duration_us,
+                    ctx,
+                )
+            )
+        except asyncio.QueueFull:
+            # The writer can't keep up — drop rather than block the tool call
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Audit queue full — %d records dropped so far", self.dropped)
+        except Exception:
+            logger.exception("Failed to queue audit record for %s", tool_name)
+
+    def count_unsampled(self, tool_name: str, duration_us: int) -> None:
+        """Count a successful call that sampling left out of ``tool_calls``.
+
+        Updates an in-memory per-tool counter only — no queue entry, no context
+        lookup — so ``tool_stats`` still covers every call.
+        """
+        if not self.enabled:
+            return
+        ts = int(time.time() * 1000)
+        duration_ms = duration_us / 1000
+        agg = self._unsampled.get(tool_name)
+        if agg is None:
+            self._unsampled[tool_name] = [
+                tool_name, 1, 0, duration_us, duration_ms * duration_ms, duration_us, ts, ts
+            ]
+        else:
+            agg[1] += 1
+            agg[3] += duration_us
+            agg[4] += duration_ms * duration_ms
+            agg[5] = max(agg[5], duration_us)
+            agg[7] = ts
+
+    async def _writer(self) -> None:
+        """Background task — drains the queue and commits records in batches.
+
+        Blocks for the first record, then takes whatever else is already queued
+        (up to ``batch_max``) so one commit covers every call that arrived meanwhile.
+        Group commit: if fewer than ``commit_siblings`` records are waiting, sleep
+        ``commit_delay_ms`` first so concurrent tool calls can join the batch.
+        Between batches (and whenever the queue sits idle) it runs WAL
+        checkpoints and ``PRAGMA optimize`` via ``_maintain``. Any unexpected error
+        is logged and the loop carries on — only the ``None`` sentinel stops it.
+        Unsampled-call counters ride along with each batch, and are written on their
+        own when the queue is idle or the writer stops.
+        """
+        while True:
+            try:
+                record = await asyncio.wait_for(self._queue.get(), self._checkpoint_idle)
+            except asyncio.TimeoutError:
+                if self._unsampled:
+                    await self._write_batch([])
+                    self._wal_dirty = True
+                await self._maintain(idle=True)
+                continue
+            if record is None:
+                if self._unsampled:
+                    await self._write_batch([])
+                return
+            stopping = False
+            try:
+                if self._commit_delay > 0 and self._queue.qsize() < self._commit_siblings:
+                    await asyncio.sleep(self._commit_delay)
+                batch = [record]
+                while len(batch) < self._batch_max:
+                    try:
+                        record = self._queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if record is None:
+                        stopping = True
+                        break
+                    batch.append(record)
+                await self._write_batch(batch)
+                self._batches_since_checkpoint += 1
+                self._wal_dirty = True
+                if not stopping:
+                    await self._maintain(idle=False)
+            except Exception:
+                logger.exception("Audit writer error — continuing")
+            if stopping:
+                return
+
+    async def _maintain(self, *, idle: bool) -> None:
+        """Keep the WAL short and planner stats fresh. Failures are logged and ignored.
+
+        Busy: a PASSIVE checkpoint every ``checkpoint_batches`` batches (never waits
+        on readers). Idle: a TRUNCATE checkpoint if anything was written since the
+        last one, resetting the WAL file to zero bytes. ``PRAGMA optimize`` runs at
+        most once per ``optimize_interval_s``.
+        """
+        try:
+            if idle and self._wal_dirty:
+                await self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._batches_since_checkpoint = 0
+                self._wal_dirty = False
+            elif self._batches_since_checkpoint >= self._checkpoint_batches:
+                await self._db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                self._batches_since_checkpoint = 0
+            if time.monotonic() >= self._next_optimize:
+                await self._db.execute("PRAGMA optimize")
+                self._next_optimize = time.monotonic() + self._optimize_interval
+        except Exception:
+            logger.exception("Audit DB maintenance failed")
+
+    async def _write_batch(self, batch: list[tuple]) -> None:
+        """Insert a batch of records in a single transaction. Failures are logged and dropped.
+
+        The ``tool_stats`` / ``seen_*`` aggregates are folded per batch in Python and
+        upserted in the same transaction, together with the pending unsampled-call
+        counters, so with sampling they count every call while ``tool_calls`` holds
+        only the sample.
+        """
+        try:
+            rows = []
+            stats, self._unsampled = self._unsampled, {}
+            clients: set[str] = set()
+            sessions: set[str] = set()
+            for ts, tool_name, parameters, success, error_msg, duration, ctx in batch:
+                request_id, session_id, client_name, client_version = _client_meta(ctx)
+                rows.append(
+                    (
+                        ts,
+                        request_id,
+                        session_id,
+                        client_name,
+                        client_version,
+                        tool_name,
+                        _params_json(parameters),
+                        success,
+                        error_msg,
+                        duration,
+                    )
+                )
+                duration_ms = duration / 1000
+                agg = stats.get(tool_name)
+                if agg is None:
+                    stats[tool_name] = [
+                        tool_name, 1, 1 - success, duration, duration_ms * duration_ms, duration, ts, ts
+                    ]
+                else:
+                    agg[1] += 1
+                    agg[2] += 1 - success
+                    agg[3] += duration
+                    agg[4] += duration_ms * duration_ms
+                    agg[5] = max(agg[5], duration)
+                    agg[6] = min(agg[6], ts)
+                    agg[7] = max(agg[7], ts)
+                if client_name is not None:
+                    clients.add(client_name)
+                if session_id is not None:
+                    sessions.add(session_id)
+
+            await self._db.executemany(_INSERT_SQL, rows)
+            await self._db.executemany(_UPSERT_STATS_SQL, stats.values())
+            await self._db.executemany(
+                "INSERT OR IGNORE INTO seen_clients VALUES (?)", ((c,) for c in clients)
+            )
+            await self._db.executemany(
+                "INSERT OR IGNORE INTO seen_sessions VALUES (?)", ((s,) for s in sessions)
             )
             await self._db.commit()
         except Exception:
-            logger.exception("Failed to write audit record for %s", tool_name)
+            logger.exception("Failed to write %d audit records", len(batch))
+            try:
+                await self._db.rollback()
+            except Exception:
+                pass
 
     # ------------------------------------------------------------------
     # Read helpers
     # ------------------------------------------------------------------
 
     async def _fetchall_dicts(self, sql: str, params: tuple = ()) -> list[dict]:
-        """Execute a query and return rows as list of dicts."""
+        """Execute a query and return rows as list of dicts keyed by the result columns."""
         await self._ensure_db()
-        self._db.row_factory = aiosqlite.Row
         cursor = await self._db.execute(sql, params)
-        rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in await cursor.fetchall()]
+
+    async def _iter_calls(self, sql: str, params: tuple = ()) -> AsyncIterator[dict]:
+        """Yield tool_calls rows as they come off the cursor, presenting
+        ``timestamp_ms`` as an ISO ``timestamp`` and ``duration_us`` as ``duration_ms``."""
+        await self._ensure_db()
+        async with self._db.execute(sql, params) as cursor:
+            cursor.arraysize = 128  # rows per fetch — aiosqlite's default of 1 is a thread hop per row
+            names = [d[0] for d in cursor.description]
+            ts = names.index("timestamp_ms")
+            dur = names.index("duration_us")
+            names[ts] = "timestamp"
+            names[dur] = "duration_ms"
+            async for values in cursor:
+                row = dict(zip(names, values))
+                row["timestamp"] = _to_iso(values[ts])
+                row["duration_ms"] = values[dur] / 1000
+                yield row
+
+    async def _fetch_calls(self, sql: str, params: tuple = ()) -> list[dict]:
+        return [row async for row in self._iter_calls(sql, params)]
 
     async def query_recent(self, *, limit: int = 50) -> list[dict]:
-        return await self._fetchall_dicts(
-            "SELECT * FROM tool_calls ORDER BY id DESC LIMIT ?",
-            (limit,),
-        )
+        return await self._fetch_calls(*_recent_query(limit))
+
+    def iter_recent(self, *, limit: int = 50) -> AsyncIterator[dict]:
+        """Like ``query_recent``, but yields rows one at a time."""
+        return self._iter_calls(*_recent_query(limit))
+
+    async def get_call(self, call_id: int) -> dict | None:
+        """Return the full audit record for one call, or None if it doesn't exist."""
+        rows = await self._fetch_calls("SELECT * FROM tool_calls WHERE id = ?", (call_id,))
+        return rows[0] if rows else None
 
     async def query_with_filters(
         self,
@@ -126,71 +683,65 @@ class AuditLogger:
         errors_only: bool = False,
         limit: int = 100,
     ) -> list[dict]:
-        clauses: list[str] = []
-        params: list[str | int] = []
-
-        if tool_name:
-            clauses.append("tool_name = ?")
-            params.append(tool_name)
-        if session_id:
-            clauses.append("session_id = ?")
-            params.append(session_id)
-        if client_name:
-            clauses.append("client_name = ?")
-            params.append(client_name)
-        if since:
-            clauses.append("timestamp >= ?")
-            params.append(since)
-        if until:
-            clauses.append("timestamp <= ?")
-            params.append(until)
-        if errors_only:
-            clauses.append("success = 0")
-
-        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
-        params.append(limit)
-        return await self._fetchall_dicts(
-            f"SELECT * FROM tool_calls{where} ORDER BY id DESC LIMIT ?",
-            tuple(params),
+        return await self._fetch_calls(
+            *_filtered_query(
+                tool_name=tool_name,
+                session_id=session_id,
+                client_name=client_name,
+                since=since,
+                until=until,
+                errors_only=errors_only,
+                limit=limit,
+            )
         )
 
-    async def get_summary_stats(self) -> dict:
-        await self._ensure_db()
-        self._db.row_factory = aiosqlite.Row
+    def iter_with_filters(self, **filters) -> AsyncIterator[dict]:
+        """Like ``query_with_filters`` (same keyword filters), but yields rows one at a time."""
+        return self._iter_calls(*_filtered_query(**filters))
 
+    async def get_summary_stats(self) -> dict:
+        """Aggregate stats read from ``tool_stats`` — O(unique tools), not O(calls)."""
         # Overall stats
-        cur = await self._db.execute(
+        (overall,) = await self._fetchall_dicts(
             """
             SELECT
-                COUNT(*)                                    AS total_calls,
-                COUNT(DISTINCT tool_name)                   AS unique_tools,
-                COUNT(DISTINCT client_name)                 AS unique_clients,
-                COUNT(DISTINCT session_id)                  AS unique_sessions,
-                ROUND(100.0 * SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) / MAX(COUNT(*), 1), 1)
+                COALESCE(SUM(calls), 0)                     AS total_calls,
+                COUNT(*)                                    AS unique_tools,
+                (SELECT COUNT(*) FROM seen_clients)         AS unique_clients,
+                (SELECT COUNT(*) FROM seen_sessions)        AS unique_sessions,
+                ROUND(100.0 * COALESCE(SUM(errors), 0) / MAX(COALESCE(SUM(calls), 0), 1), 1)
                                                             AS error_rate_pct,
-                ROUND(AVG(duration_ms), 1)                  AS avg_duration_ms,
-                ROUND(MAX(duration_ms), 1)                  AS max_duration_ms,
-                MIN(timestamp)                              AS first_call,
-                MAX(timestamp)                              AS last_call
-            FROM tool_calls
+                ROUND(SUM(sum_dur_us) / 1000.0 / SUM(calls), 1)
+                                                            AS avg_duration_ms,
+                ROUND(MAX(max_dur_us) / 1000.0, 1)          AS max_duration_ms,
+                MIN(first_ts)                               AS first_call,
+                MAX(last_ts)                                AS last_call
+            FROM tool_stats
             """
         )
-        overall = dict(await cur.fetchone())
+        overall["first_call"] = _to_iso(overall["first_call"])
+        overall["last_call"] = _to_iso(overall["last_call"])
 
         # Per-tool breakdown
         rows = await self._fetchall_dicts(
             """
             SELECT
                 tool_name,
-                COUNT(*)                                    AS calls,
-                ROUND(100.0 * SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) / MAX(COUNT(*), 1), 1)
-                                                            AS error_rate_pct,
-                ROUND(AVG(duration_ms), 1)                  AS avg_duration_ms,
-                ROUND(MAX(duration_ms), 1)                  AS max_duration_ms
-            FROM tool_calls
-            GROUP BY tool_name
+                calls,
+                ROUND(100.0 * errors / MAX(calls, 1), 1)    AS error_rate_pct,
+                ROUND(sum_dur_us / 1000.0 / calls, 1)       AS avg_duration_ms,
+                sum_sq_dur_ms / calls - (sum_dur_us / 1000.0 / calls) * (sum_dur_us / 1000.0 / calls)
+                                                            AS var_duration_ms,
+                ROUND(max_dur_us / 1000.0, 1)               AS max_duration_ms
+            FROM tool_stats
             ORDER BY calls DESC
             """
         )
+        # SQLite's sqrt() is a compile-time option, so the square root is taken here;
+        # clamp float rounding noise that can leave a constant series slightly negative
+        for row in rows:
+            var = row.pop("var_duration_ms")
+            row["stddev_duration_ms"] = round(math.sqrt(max(var, 0.0)), 1)
+            row["max_duration_ms"] = row.pop("max_duration_ms")  # keep the key order
 
         return {"overall": overall, "per_tool": rows}
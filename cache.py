@@ -0,0 +1,103 @@
+"""In-memory TTL cache for idempotent TM API responses."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Bounded LRU cache with per-entry TTL and in-flight request coalescing.
+
+    Concurrent misses for the same key share one upstream fetch, so a cold or
+    just-expired entry never triggers a burst of identical requests. Entries
+    stored with ``refresh_after`` are stale-while-revalidate: once that age is
+    passed, hits still return the cached value but start one background refetch.
+    Safe under asyncio without locks — all bookkeeping happens between awaits.
+    """
+
+    def __init__(self, *, maxsize: int = 512, ttl: float = 60.0) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        # key -> (refresh_at, expires_at, value)
+        self._entries: OrderedDict[Hashable, tuple[float, float, str]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[str]],
+        ttl: float | None = None,
+        refresh_after: float | None = None,
+    ) -> str:
+        """Return the cached value for ``key``, calling ``fetch`` on a miss.
+
+        ``ttl`` bounds how long a value may be served at all; with ``refresh_after``
+        (< ttl), hits on an older value trigger a background refresh.
+        """
+        ttl = self._ttl if ttl is None else ttl
+        entry = self._entries.get(key)
+        if entry is not None:
+            refresh_at, expires_at, value = entry
+            now = time.monotonic()
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                logger.debug("Cache HIT %r", key)
+                if refresh_at <= now and key not in self._inflight:
+                    task = asyncio.create_task(self._fill(key, fetch, ttl, refresh_after))
+                    task.add_done_callback(_log_refresh_failure)
+                    self._inflight[key] = task
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        logger.debug("Cache MISS %r", key)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fill(key, fetch, ttl, refresh_after))
+            self._inflight[key] = task
+        # shield: one caller being cancelled must not cancel the fetch the others await
+        return await asyncio.shield(task)
+
+    async def _fill(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[str]],
+        ttl: float,
+        refresh_after: float | None,
+    ) -> str:
+        try:
+            value = await fetch()
+        finally:
+            self._inflight.pop(key, None)
+        now = time.monotonic()
+        refresh_at = now + (ttl if refresh_after is None else refresh_after)
+        self._entries[key] = (refresh_at, now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        """Entry count and hit/miss counters since startup."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxsize": self._maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_pct": round(100 * self.hits / lookups, 1) if lookups else 0.0,
+        }
+
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    """Background refreshes have no awaiting caller — log their errors instead of
+    leaving them as never-retrieved task exceptions. The stale value stays cached."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background cache refresh failed: %r", task.exception())
@@ -19,8 +19,53 @@ class Settings(BaseSettings):
     # Request timeout (seconds)
     tm_api_timeout: float = 30.0
 
-    # Audit log SQLite database path
+    # Upstream connection pool — keep-alive should cover expected tool-call concurrency
+    tm_api_max_connections: int = 100
+    tm_api_max_keepalive: int = 50
+    # Max TM API requests in flight at once across all tool calls (extra ones wait)
+    tm_api_max_inflight: int = 32
+
+    # Attempts per TM API request on connection errors / 502-504, with exponential
+    # backoff starting at tm_api_retry_backoff seconds (jittered, capped at 2s)
+    tm_api_max_attempts: int = 3
+    tm_api_retry_backoff: float = 0.1
+
+    # In-memory cache for TM API reads — employee/skill data expires after
+    # tm_cache_ttl, the browse_skills catalog after tm_cache_catalog_ttl; catalog hits
+    # older than tm_cache_catalog_refresh are refreshed in the background
+    tm_cache_ttl: float = 60.0
+    tm_cache_catalog_ttl: float = 600.0
+    tm_cache_catalog_refresh: float = 60.0
+    tm_cache_maxsize: int = 512
+
+    # Audit log SQLite database path; set audit_enabled=false to skip recording tool calls
     audit_db_path: str = "audit.db"
+    audit_enabled: bool = True
+
+    # Max audit records waiting for the writer; beyond this new records are dropped
+    audit_queue_max: int = 10000
+
+    # Audit group commit — if fewer than `siblings` records are queued, the writer
+    # waits `delay_ms` for concurrent calls to join the batch before committing
+    audit_commit_delay_ms: float = 2.0
+    audit_commit_siblings: int = 4
+    audit_batch_max: int = 512
+
+    # Audit SQLite page cache (KiB) and memory-mapped I/O size (bytes) — size to the
+    # container's memory budget
+    audit_cache_size_kib: int = 65536
+    audit_mmap_size: int = 268435456
+
+    # Audit DB maintenance — WAL checkpoint every N batches or after M idle seconds,
+    # PRAGMA optimize at most once per interval
+    audit_checkpoint_batches: int = 64
+    audit_checkpoint_idle_s: float = 5.0
+    audit_optimize_interval_s: float = 3600.0
+
+    # Fraction of successful browse_skills calls written to tool_calls (errors are always
+    # logged, and /audit/summary still counts every call) — the catalog is browsed
+    # constantly and the rows add little signal
+    audit_browse_sample_rate: float = 0.1
 
     # CORS origins (comma-separated) — needed for the monitoring dashboard
     cors_origins: str = "http://localhost:5173,http://localhost:4173"
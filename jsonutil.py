@@ -0,0 +1,22 @@
+"""JSON serialization shared by the server and the audit logger."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup — falls back to stdlib json
+    orjson = None
+
+
+def dumps(obj, pretty: bool = False) -> str:
+    """Serialize to a JSON string; ``pretty`` indents by 2 spaces for LLM readability."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    return json.dumps(obj, indent=2 if pretty else None)
+
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, for response bodies."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
@@ -1,34 +1,119 @@
 """TM Skills MCP Server — exposes the Talent Management API as MCP tools, resources, and prompts."""
 
-import json
+import asyncio
+import inspect
+import logging
+import random
+import string
 import time
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
 from functools import wraps
 from pathlib import Path
+from typing import Annotated, TypeVar
 
 import httpx
 from mcp.server.fastmcp import Context, FastMCP
+from pydantic import Field
+from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 
 from audit import AuditLogger
+from cache import ResponseCache
 from config import settings
+from jsonutil import dumps, dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ---------------------------------------------------------------------------
+# JSON responses — orjson when installed (see jsonutil)
+# ---------------------------------------------------------------------------
+
+
+class ORJSONResponse(JSONResponse):
+    """``JSONResponse`` that renders with orjson when it is installed."""
+
+    def render(self, content) -> bytes:
+        return dumps_bytes(content)
+
 
 # ---------------------------------------------------------------------------
 # Audit logger — module-level so MCP tools and REST endpoints share it
 # ---------------------------------------------------------------------------
 
-audit_logger = AuditLogger(settings.audit_db_path)
+audit_logger = AuditLogger(
+    settings.audit_db_path,
+    enabled=settings.audit_enabled,
+    queue_max=settings.audit_queue_max,
+    batch_max=settings.audit_batch_max,
+    commit_delay_ms=settings.audit_commit_delay_ms,
+    commit_siblings=settings.audit_commit_siblings,
+    cache_size_kib=settings.audit_cache_size_kib,
+    mmap_size=settings.audit_mmap_size,
+    checkpoint_batches=settings.audit_checkpoint_batches,
+    checkpoint_idle_s=settings.audit_checkpoint_idle_s,
+    optimize_interval_s=settings.audit_optimize_interval_s,
+)
 
 
-@asynccontextmanager
-async def audit_lifespan(app: FastMCP) -> AsyncIterator[dict]:
-    await audit_logger.initialize()
-    yield {}
+# Set while app_lifespan runs — the Streamable HTTP app then owns startup/shutdown
+_app_lifespan_active = False
+
+
+async def _startup() -> None:
+    if audit_logger.enabled:
+        await audit_logger.initialize()
+    _get_http_client()
+
+
+async def _shutdown() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
     await audit_logger.close()
 
 
+@asynccontextmanager
+async def app_lifespan(app: Starlette) -> AsyncIterator[None]:
+    """Process-wide startup/shutdown for the Streamable HTTP app.
+
+    FastMCP's own ``lifespan`` hook runs once per MCP session, so the audit
+    writer and the shared HTTP client are managed here instead and the session
+    manager is nested inside.
+    """
+    global _app_lifespan_active
+    _app_lifespan_active = True
+    await _startup()
+    try:
+        async with mcp.session_manager.run():
+            yield
+    finally:
+        await _shutdown()
+        _app_lifespan_active = False
+
+
+@asynccontextmanager
+async def mcp_lifespan(server: FastMCP) -> AsyncIterator[dict]:
+    """FastMCP lifespan — owns startup/shutdown for stdio runs (e.g. ``mcp dev``).
+
+    Without it nothing would flush the audit queue or close the DB, and
+    aiosqlite's non-daemon thread would keep the process alive. Under Streamable
+    HTTP it runs per session and defers to ``app_lifespan``.
+    """
+    if _app_lifespan_active:
+        yield {}
+        return
+    await _startup()
+    try:
+        yield {}
+    finally:
+        await _shutdown()
+
+
 # ---------------------------------------------------------------------------
 # Server setup
 # ---------------------------------------------------------------------------
@@ -45,61 +130,46 @@ mcp = FastMCP(
     ),
     host=settings.host,
     port=settings.port,
-    lifespan=audit_lifespan,
+    lifespan=mcp_lifespan,
 )
 
 RESOURCES_DIR = Path(__file__).parent / "resources"
 
+# Resource files are static — read once at import rather than on every fetch
+_SCHEMA_TEXT = (RESOURCES_DIR / "tm_schema.sql").read_text()
+_BUSINESS_QUESTIONS_TEXT = (RESOURCES_DIR / "business_questions.md").read_text()
+
 
 # ---------------------------------------------------------------------------
 # @audited decorator — wraps tool functions with audit logging
 # ---------------------------------------------------------------------------
 
 
-def audited(fn):
+def audited(fn=None, *, sample_rate: float = 1.0):
     """Decorator that logs tool invocations to the audit database.
 
-    Extracts session/client metadata from the MCP Context, measures duration,
-    and records success/failure. Never lets audit errors propagate to callers.
+    Measures duration, records success/failure, and hands the MCP Context to the
+    audit logger for session/client metadata. Never lets audit errors propagate
+    to callers.
+
+    Use as ``@audited`` or ``@audited(sample_rate=0.1)``: with a sample rate below
+    1.0 only that fraction of successful calls gets a ``tool_calls`` row. Failures
+    are always recorded, and unsampled successes still count towards the summary
+    aggregates. When auditing is disabled (``AUDIT_ENABLED=false``) the wrapper just
+    awaits the tool.
     """
+    if fn is None:
+        return lambda f: audited(f, sample_rate=sample_rate)
 
     @wraps(fn)
     async def wrapper(*args, **kwargs):
-        start = time.perf_counter()
+        if not audit_logger.enabled:
+            return await fn(*args, **kwargs)
+
+        start = time.perf_counter_ns()
         success = True
         error_msg = None
 
-        # Extract context metadata (graceful degradation if unavailable)
-        request_id = None
-        session_id = None
-        client_name = None
-        client_version = None
-        try:
-            ctx: Context | None = kwargs.get("ctx")
-            if ctx:
-                # Session ID from the MCP session
-                try:
-                    session_id = ctx.session.client_params.meta.sessionId
-                except Exception:
-                    pass
-                # Client info from MCP handshake
-                try:
-                    client_info = ctx.session.client_params.clientInfo
-                    client_name = client_info.name
-                    client_version = client_info.version
-                except Exception:
-                    pass
-                # Request ID from the current JSON-RPC message
-                try:
-                    request_id = str(ctx.request_id)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-        # Build parameter dict (exclude ctx)
-        params = {k: v for k, v in kwargs.items() if k != "ctx"}
-
         try:
             result = await fn(*args, **kwargs)
             return result
@@ -108,19 +178,21 @@ def audited(fn):
             error_msg = str(exc)
             raise
         finally:
-            duration_ms = (time.perf_counter() - start) * 1000
+            duration_us = (time.perf_counter_ns() - start) // 1000
             try:
-                await audit_logger.log_tool_call(
-                    tool_name=fn.__name__,
-                    parameters=params or None,
-                    success=success,
-                    error_msg=error_msg,
-                    duration_ms=duration_ms,
-                    request_id=request_id,
-                    session_id=session_id,
-                    client_name=client_name,
-                    client_version=client_version,
-                )
+                if not success or sample_rate >= 1.0 or random.random() < sample_rate:
+                    # Session/client metadata is read from ctx by the audit writer,
+                    # off the request path
+                    await audit_logger.log_tool_call(
+                        tool_name=fn.__name__,
+                        parameters={k: v for k, v in kwargs.items() if k != "ctx"} or None,
+                        success=success,
+                        error_msg=error_msg,
+                        duration_us=duration_us,
+                        ctx=kwargs.get("ctx"),
+                    )
+                else:
+                    audit_logger.count_unsampled(fn.__name__, duration_us)
             except Exception:
                 pass  # never let audit errors propagate
 
@@ -128,23 +200,178 @@ def audited(fn):
 
 
 # ---------------------------------------------------------------------------
-# HTTP client helper
+# HTTP client — one pooled client shared by every tool call
 # ---------------------------------------------------------------------------
 
 
+# httpx already sends Accept-Encoding for every decoder it has (gzip, deflate, and br
+# with the brotli extra) and decompresses transparently
+_API_HEADERS = {"User-Agent": "tm-mcp-server/0.1.0"}
+if settings.tm_api_key:
+    _API_HEADERS["X-API-Key"] = settings.tm_api_key
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared TM API client, creating it on first use.
+
+    Keep-alive (and HTTP/2 over TLS) lets consecutive tool calls reuse the same
+    connection instead of paying a TCP+TLS handshake each time.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=settings.tm_api_base_url,
+            timeout=settings.tm_api_timeout,
+            headers=_API_HEADERS,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.tm_api_max_keepalive,
+                max_connections=settings.tm_api_max_connections,
+            ),
+        )
+    return _http_client
+
+
+# Caps concurrent TM API requests across all tool calls, so a burst (e.g. several batch
+# tools at once) queues here instead of piling onto the API and timing out in the pool
+_upstream_slots = asyncio.Semaphore(settings.tm_api_max_inflight)
+
+# Gateway errors from the CF router / a restarting API instance — worth another try
+_RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+async def _with_retries(path: str, attempt: Callable[[], Awaitable[T]]) -> T:
+    """Run ``attempt`` up to ``tm_api_max_attempts`` times, retrying transport errors
+    and 502/503/504 with full-jitter exponential backoff. Other 4xx/5xx raise at once."""
+    retries = settings.tm_api_max_attempts - 1
+    for n in range(1, retries + 1):
+        try:
+            return await attempt()
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code not in _RETRY_STATUSES:
+                raise
+            reason = str(exc.response.status_code)
+        except httpx.TransportError as exc:
+            reason = type(exc).__name__
+        delay = random.uniform(0, min(2.0, settings.tm_api_retry_backoff * 2 ** (n - 1)))
+        logger.warning("GET %s failed (%s) — retry %d/%d in %.2fs", path, reason, n, retries, delay)
+        await asyncio.sleep(delay)
+    return await attempt()
+
+
+def _request_key(path: str, params: dict | None) -> tuple:
+    return (path, tuple(sorted(params.items())) if params else ())
+
+
+def _coalesced(fetch):
+    """Make concurrent identical calls to ``fetch(path, params)`` share one request.
+
+    Covers what the response cache can't: the streamed (uncached) endpoints, and
+    callers that bypass the cache.
+    """
+    inflight: dict[tuple, asyncio.Task] = {}
+
+    def done(key: tuple, task: asyncio.Task) -> None:
+        inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved — every waiter may have been cancelled
+
+    @wraps(fetch)
+    async def wrapper(path: str, params: dict | None = None) -> str:
+        key = _request_key(path, params)
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch(path, params))
+            inflight[key] = task
+            task.add_done_callback(lambda t: done(key, t))
+        # shield: one caller being cancelled must not cancel the request the others await
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+def _note_if_queued(path: str) -> None:
+    if _upstream_slots.locked():
+        logger.debug("Upstream limit (%d) reached — GET %s waits", settings.tm_api_max_inflight, path)
+
+
+@_coalesced
 async def _api_get(path: str, params: dict | None = None) -> str:
     """Make a GET request to the TM Skills API and return the JSON response as a string."""
-    headers = {}
-    if settings.tm_api_key:
-        headers["X-API-Key"] = settings.tm_api_key
-
-    async with httpx.AsyncClient(
-        base_url=settings.tm_api_base_url,
-        timeout=settings.tm_api_timeout,
-    ) as client:
-        response = await client.get(path, params=params, headers=headers)
+
+    async def attempt() -> httpx.Response:
+        _note_if_queued(path)
+        async with _upstream_slots:
+            response = await _get_http_client().get(path, params=params)
         response.raise_for_status()
-        return response.text
+        return response
+
+    response = await _with_retries(path, attempt)
+    logger.debug(
+        "GET %s: %d bytes on the wire, %d decoded",
+        path, response.num_bytes_downloaded, len(response.content),
+    )
+    # JSON is always UTF-8 — decode the body once, skipping httpx's charset resolution
+    return response.content.decode("utf-8", errors="replace")
+
+
+@_coalesced
+async def _api_get_streamed(path: str, params: dict | None = None) -> str:
+    """Like ``_api_get``, but reads the body chunk by chunk into a single buffer.
+
+    For multi-megabyte responses this skips httpx's list-of-chunks + joined copy,
+    so peak memory is one buffer plus the decoded string.
+    """
+
+    async def attempt() -> bytearray:
+        body = bytearray()
+        _note_if_queued(path)
+        async with _upstream_slots, _get_http_client().stream(
+            "GET", path, params=params
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(65536):
+                body += chunk
+            logger.debug(
+                "GET %s: %d bytes on the wire, %d decoded",
+                path, response.num_bytes_downloaded, len(body),
+            )
+        return body
+
+    return (await _with_retries(path, attempt)).decode("utf-8", errors="replace")
+
+
+# Short-TTL cache for reads that LLM sessions repeat with identical arguments
+response_cache = ResponseCache(maxsize=settings.tm_cache_maxsize, ttl=settings.tm_cache_ttl)
+
+
+async def _api_get_cached(
+    path: str,
+    params: dict | None = None,
+    *,
+    ttl: float | None = None,
+    refresh_after: float | None = None,
+) -> str:
+    """Like ``_api_get``, but identical requests within ``ttl`` seconds (default
+    ``tm_cache_ttl``) are served from memory, and concurrent identical misses share
+    one upstream call. See ``ResponseCache.get_or_fetch`` for ``refresh_after``."""
+    key = _request_key(path, params)
+    return await response_cache.get_or_fetch(
+        key, lambda: _api_get(path, params), ttl, refresh_after
+    )
+
+
+async def _api_get_many(requests: list[tuple[str, dict | None]]) -> str:
+    """Fetch several ``(path, params)`` requests concurrently and return their bodies
+    as one JSON array, in request order. Any failure fails the whole batch.
+    Upstream concurrency is bounded by ``_api_get``."""
+    bodies = await asyncio.gather(
+        *(_api_get_cached(path, params=params) for path, params in requests)
+    )
+    # Each body is already a JSON document — splice them rather than re-serialize
+    return "[" + ",".join(bodies) + "]"
 
 
 # ===========================================================================
@@ -155,80 +382,142 @@ async def _api_get(path: str, params: dict | None = None) -> str:
 @mcp.resource("tm://schema")
 def get_schema() -> str:
     """The TM database schema — tables, columns, types, indexes, and relationships."""
-    return (RESOURCES_DIR / "tm_schema.sql").read_text()
+    return _SCHEMA_TEXT
 
 
 @mcp.resource("tm://business-questions")
 def get_business_questions() -> str:
     """Catalog of 12 business questions the TM Skills API can answer, with endpoint mappings."""
-    return (RESOURCES_DIR / "business_questions.md").read_text()
+    return _BUSINESS_QUESTIONS_TEXT
 
 
 # ===========================================================================
 # TOOLS — one per API endpoint
 # ===========================================================================
 
-# --- Employee-centric tools (Endpoints 1, 2, 8, 10) ---
+# Endpoints that map straight from tool arguments to a GET are declared as data
+# and turned into tools by _make_api_tool. Each entry is
+# (tool name, path template, [(param, type) or (param, type, default)], docstring[, fetch]).
+# Params named in the path template fill it in; the rest become query params.
+# Numeric params are ints with their valid range, so FastMCP rejects bad values before
+# any upstream call; pydantic's lax mode still accepts Joule Studio's 1.0 / "1.0".
+# fetch defaults to _api_get_cached (every TM read is idempotent); use
+# _api_get_streamed, which bypasses the cache, for endpoints with very large responses.
+
+# Upper bounds keep absurd values out of upstream URLs and the audit log
+_SKILL_ID_MAX = 2**31 - 1
+_SkillId = Annotated[int, Field(ge=1, le=_SKILL_ID_MAX)]
+_Proficiency = Annotated[int, Field(ge=0, le=5)]
+_Limit50 = Annotated[int, Field(ge=1, le=50)]
+_Limit100 = Annotated[int, Field(ge=1, le=100)]
+_Days = Annotated[int, Field(ge=1, le=36500)]
+# ID formats the TM API accepts — malformed IDs fail validation instead of costing a 4xx round trip
+_EmployeeId = Annotated[str, Field(pattern=r"^EMP\d{6}$")]
+_OrgUnitId = Annotated[str, Field(pattern=r"^ORG\d{1,4}[A-Z]?$")]
+
+
+def _make_api_tool(name: str, path: str, params: list[tuple], doc: str, get=_api_get_cached):
+    """Build an audited tool coroutine that forwards its arguments to ``path``."""
+    path_names = {field for _, field, _, _ in string.Formatter().parse(path) if field}
+    names = [p[0] for p in params]
+    query_names = [n for n in names if n not in path_names]
+
+    async def tool(**kwargs) -> str:
+        args = {n: kwargs[n] for n in names}
+        return await get(
+            path.format_map(args),
+            params={n: args[n] for n in query_names} or None,
+        )
+
+    signature = [
+        inspect.Parameter(
+            p[0],
+            inspect.Parameter.KEYWORD_ONLY,
+            annotation=p[1],
+            default=p[2] if len(p) > 2 else inspect.Parameter.empty,
+        )
+        for p in params
+    ]
+    signature.append(
+        inspect.Parameter("ctx", inspect.Parameter.KEYWORD_ONLY, annotation=Context, default=None)
+    )
+    tool.__name__ = tool.__qualname__ = name
+    tool.__doc__ = doc
+    tool.__signature__ = inspect.Signature(signature, return_annotation=str)
+    tool.__annotations__ = {p.name: p.annotation for p in signature} | {"return": str}
+    return audited(tool)
 
 
-@mcp.tool()
-@audited
-async def get_employee_skills(employee_id: str, ctx: Context = None) -> str:
-    """Get the full skill profile for an employee — all skills with proficiency (0-5),
+# Path template of every generated tool, by tool name — the batch tools reuse these
+# so each endpoint URL is spelled out exactly once
+_API_PATHS: dict[str, str] = {}
+
+
+def _register_api_tools(specs: list[tuple]) -> None:
+    for spec in specs:
+        _API_PATHS[spec[0]] = spec[1]
+        mcp.tool()(_make_api_tool(*spec))
+
+
+# --- Employee-centric tools (Endpoints 1, 2, 8, 10) ---
+
+_EMPLOYEE_TOOLS = [
+    (
+        "get_employee_skills",
+        "/tm/employees/{employee_id}/skills",
+        [("employee_id", _EmployeeId)],
+        """Get the full skill profile for an employee — all skills with proficiency (0-5),
     confidence (0-100), source, and last updated date.
 
     Args:
         employee_id: Employee ID in format EMP followed by 6 digits (e.g. EMP000001)
-    """
-    return await _api_get(f"/tm/employees/{employee_id}/skills")
-
-
-@mcp.tool()
-@audited
-async def get_skill_evidence(employee_id: str, skill_id: float, ctx: Context = None) -> str:
-    """Get the evidence behind an employee's skill rating — certifications, projects,
+    """,
+    ),
+    (
+        "get_skill_evidence",
+        "/tm/employees/{employee_id}/skills/{skill_id}/evidence",
+        [("employee_id", _EmployeeId), ("skill_id", _SkillId)],
+        """Get the evidence behind an employee's skill rating — certifications, projects,
     assessments, peer endorsements, etc.
 
     Args:
         employee_id: Employee ID (e.g. EMP000001)
         skill_id: Numeric skill ID (use browse_skills to find IDs by name)
-    """
-    return await _api_get(f"/tm/employees/{employee_id}/skills/{int(skill_id)}/evidence")
-
-
-@mcp.tool()
-@audited
-async def get_top_skills(employee_id: str, limit: float = 10, ctx: Context = None) -> str:
-    """Get an employee's strongest skills ranked by proficiency and confidence —
+    """,
+    ),
+    (
+        "get_top_skills",
+        "/tm/employees/{employee_id}/top-skills",
+        [("employee_id", _EmployeeId), ("limit", _Limit50, 10)],
+        """Get an employee's strongest skills ranked by proficiency and confidence —
     a "skill passport" view.
 
     Args:
         employee_id: Employee ID (e.g. EMP000001)
         limit: Number of top skills to return (1-50, default 10)
-    """
-    return await _api_get(
-        f"/tm/employees/{employee_id}/top-skills",
-        params={"limit": int(limit)},
-    )
-
-
-@mcp.tool()
-@audited
-async def get_evidence_inventory(employee_id: str, ctx: Context = None) -> str:
-    """Get ALL evidence items across ALL skills for an employee — the complete
+    """,
+    ),
+    (
+        "get_evidence_inventory",
+        "/tm/employees/{employee_id}/evidence",
+        [("employee_id", _EmployeeId)],
+        """Get ALL evidence items across ALL skills for an employee — the complete
     evidence inventory (certifications, projects, endorsements).
 
     Args:
         employee_id: Employee ID (e.g. EMP000001)
-    """
-    return await _api_get(f"/tm/employees/{employee_id}/evidence")
+    """,
+        _api_get_streamed,
+    ),
+]
+_register_api_tools(_EMPLOYEE_TOOLS)
 
 
 # --- Skill-centric tools (Endpoints 3, 4, 6, 7, 9, 11) ---
 
 
 @mcp.tool()
-@audited
+@audited(sample_rate=settings.audit_browse_sample_rate)
 async def browse_skills(
     category: str | None = None,
     search: str | None = None,
@@ -246,60 +535,51 @@ async def browse_skills(
         params["category"] = category
     if search:
         params["search"] = search
-    return await _api_get("/tm/skills", params=params)
+    # Every workflow starts here and the catalog rarely changes — serve it from cache
+    # (stale-while-revalidate) so no call waits on a refresh
+    return await _api_get_cached(
+        "/tm/skills",
+        params=params,
+        ttl=settings.tm_cache_catalog_ttl,
+        refresh_after=settings.tm_cache_catalog_refresh,
+    )
 
 
-@mcp.tool()
-@audited
-async def get_top_experts(
-    skill_id: float,
-    min_proficiency: float = 4,
-    limit: float = 20,
-    ctx: Context = None,
-) -> str:
-    """Find the top experts for a specific skill — ranked by proficiency, confidence, and recency.
+_SKILL_TOOLS = [
+    (
+        "get_top_experts",
+        "/tm/skills/{skill_id}/experts",
+        [("skill_id", _SkillId), ("min_proficiency", _Proficiency, 4), ("limit", _Limit100, 20)],
+        """Find the top experts for a specific skill — ranked by proficiency, confidence, and recency.
 
     Args:
         skill_id: Numeric skill ID (use browse_skills to find IDs)
         min_proficiency: Minimum proficiency level 0-5 (default 4)
         limit: Max results to return 1-100 (default 20)
-    """
-    return await _api_get(
-        f"/tm/skills/{int(skill_id)}/experts",
-        params={"min_proficiency": int(min_proficiency), "limit": int(limit)},
-    )
-
-
-@mcp.tool()
-@audited
-async def get_skill_coverage(
-    skill_id: float,
-    min_proficiency: float = 3,
-    ctx: Context = None,
-) -> str:
-    """Get the proficiency distribution for a skill — how many employees at each level (0-5)
+    """,
+    ),
+    (
+        "get_skill_coverage",
+        "/tm/skills/{skill_id}/coverage",
+        [("skill_id", _SkillId), ("min_proficiency", _Proficiency, 3)],
+        """Get the proficiency distribution for a skill — how many employees at each level (0-5)
     and total count above a threshold.
 
     Args:
         skill_id: Numeric skill ID
         min_proficiency: Threshold for the coverage count 0-5 (default 3)
-    """
-    return await _api_get(
-        f"/tm/skills/{int(skill_id)}/coverage",
-        params={"min_proficiency": int(min_proficiency)},
-    )
-
-
-@mcp.tool()
-@audited
-async def get_evidence_backed_candidates(
-    skill_id: float,
-    min_proficiency: float = 3,
-    min_evidence_strength: float = 4,
-    limit: float = 20,
-    ctx: Context = None,
-) -> str:
-    """Find employees with a skill AND strong evidence to back it up — certifications,
+    """,
+    ),
+    (
+        "get_evidence_backed_candidates",
+        "/tm/skills/{skill_id}/candidates",
+        [
+            ("skill_id", _SkillId),
+            ("min_proficiency", _Proficiency, 3),
+            ("min_evidence_strength", Annotated[int, Field(ge=1, le=5)], 4),
+            ("limit", _Limit100, 20),
+        ],
+        """Find employees with a skill AND strong evidence to back it up — certifications,
     project work, assessments with high signal strength.
 
     Args:
@@ -307,57 +587,35 @@ async def get_evidence_backed_candidates(
         min_proficiency: Minimum proficiency level 0-5 (default 3)
         min_evidence_strength: Minimum evidence signal strength 1-5 (default 4)
         limit: Max candidates to return 1-100 (default 20)
-    """
-    return await _api_get(
-        f"/tm/skills/{int(skill_id)}/candidates",
-        params={
-            "min_proficiency": int(min_proficiency),
-            "min_evidence_strength": int(min_evidence_strength),
-            "limit": int(limit),
-        },
-    )
-
-
-@mcp.tool()
-@audited
-async def get_stale_skills(
-    skill_id: float,
-    older_than_days: float = 365,
-    ctx: Context = None,
-) -> str:
-    """Find employees whose skill record hasn't been validated or updated recently —
+    """,
+    ),
+    (
+        "get_stale_skills",
+        "/tm/skills/{skill_id}/stale",
+        [("skill_id", _SkillId), ("older_than_days", _Days, 365)],
+        """Find employees whose skill record hasn't been validated or updated recently —
     useful for governance and freshness checks.
 
     Args:
         skill_id: Numeric skill ID
         older_than_days: Skills not updated in this many days (default 365)
-    """
-    return await _api_get(
-        f"/tm/skills/{int(skill_id)}/stale",
-        params={"older_than_days": int(older_than_days)},
-    )
-
-
-@mcp.tool()
-@audited
-async def get_cooccurring_skills(
-    skill_id: float,
-    min_proficiency: float = 3,
-    top: float = 20,
-    ctx: Context = None,
-) -> str:
-    """Discover which skills commonly co-occur with a given skill — "people who know X
+    """,
+    ),
+    (
+        "get_cooccurring_skills",
+        "/tm/skills/{skill_id}/cooccurring",
+        [("skill_id", _SkillId), ("min_proficiency", _Proficiency, 3), ("top", _Limit50, 20)],
+        """Discover which skills commonly co-occur with a given skill — "people who know X
     also tend to know Y". Useful for recommendations and skill adjacency analysis.
 
     Args:
         skill_id: Numeric skill ID
         min_proficiency: Minimum proficiency to consider 0-5 (default 3)
         top: Number of co-occurring skills to return 1-50 (default 20)
-    """
-    return await _api_get(
-        f"/tm/skills/{int(skill_id)}/cooccurring",
-        params={"min_proficiency": int(min_proficiency), "top": int(top)},
-    )
+    """,
+    ),
+]
+_register_api_tools(_SKILL_TOOLS)
 
 
 # --- Talent search tool (Endpoint 5) ---
@@ -367,7 +625,7 @@ async def get_cooccurring_skills(
 @audited
 async def search_talent(
     skills: str,
-    min_proficiency: float = 3,
+    min_proficiency: _Proficiency = 3,
     ctx: Context = None,
 ) -> str:
     """Find employees who have ALL specified skills at a minimum proficiency — an AND search.
@@ -377,56 +635,153 @@ async def search_talent(
         skills: Comma-separated skill names (e.g. "Python,SQL,Docker") — max 10 skills
         min_proficiency: Minimum proficiency for each skill 0-5 (default 3)
     """
-    return await _api_get(
+    # Normalize before the request so duplicates don't widen the backend's search and
+    # equivalent spellings ("SQL, Python" / "Python,SQL,python") share a cache entry
+    names: dict[str, str] = {}
+    for name in skills.split(","):
+        name = name.strip()
+        if name:
+            names.setdefault(name.casefold(), name)
+    if not names:
+        raise ValueError("skills must contain at least one skill name")
+    if len(names) > 10:
+        raise ValueError(f"At most 10 skills per search (got {len(names)})")
+    return await _api_get_cached(
         "/tm/talent/search",
-        params={"skills": skills, "min_proficiency": int(min_proficiency)},
+        params={
+            "skills": ",".join(sorted(names.values(), key=str.casefold)),
+            "min_proficiency": min_proficiency,
+        },
     )
 
 
 # --- Org-centric tools (Endpoint 12) ---
 
+_ORG_TOOLS = [
+    (
+        "get_org_skill_summary",
+        "/tm/orgs/{org_unit_id}/skills/summary",
+        [("org_unit_id", _OrgUnitId), ("limit", _Limit100, 20)],
+        """Get the top skills in an org unit (including all child orgs in the hierarchy) —
+    aggregate counts and top experts per skill.
+
+    Args:
+        org_unit_id: Org unit ID (e.g. ORG030, ORG031B)
+        limit: Number of top skills to return 1-100 (default 20)
+    """,
+        _api_get_streamed,
+    ),
+    (
+        "get_org_skill_experts",
+        "/tm/orgs/{org_unit_id}/skills/{skill_id}/experts",
+        [
+            ("org_unit_id", _OrgUnitId),
+            ("skill_id", _SkillId),
+            ("min_proficiency", _Proficiency, 3),
+            ("limit", _Limit100, 20),
+        ],
+        """Find employees within an org unit who have a specific skill — scoped to the
+    org hierarchy (includes child orgs).
+
+    Args:
+        org_unit_id: Org unit ID (e.g. ORG030, ORG031B)
+        skill_id: Numeric skill ID
+        min_proficiency: Minimum proficiency level 0-5 (default 3)
+        limit: Max results 1-100 (default 20)
+    """,
+    ),
+]
+_register_api_tools(_ORG_TOOLS)
+
+
+# --- Batch tools — fetch several skills in one call, fanned out concurrently ---
+
+_BATCH_MAX_IDS = 10
+
+
+def _parse_skill_ids(skill_ids: str) -> list[int]:
+    """Parse a comma-separated list of numeric skill IDs, dropping duplicates."""
+    ids: dict[int, None] = {}
+    for part in skill_ids.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = float(part)  # accepts "42" and "42.0"
+        except ValueError:
+            value = 0.0
+        if not value.is_integer() or not 1 <= value <= _SKILL_ID_MAX:
+            raise ValueError(f"Invalid skill ID: {part!r}")
+        ids[int(value)] = None
+    if not ids:
+        raise ValueError("skill_ids must contain at least one skill ID")
+    if len(ids) > _BATCH_MAX_IDS:
+        raise ValueError(f"At most {_BATCH_MAX_IDS} skill IDs per call")
+    return list(ids)
+
 
 @mcp.tool()
 @audited
-async def get_org_skill_summary(
-    org_unit_id: str,
-    limit: float = 20,
+async def get_skill_coverage_batch(
+    skill_ids: str,
+    min_proficiency: _Proficiency = 3,
     ctx: Context = None,
 ) -> str:
-    """Get the top skills in an org unit (including all child orgs in the hierarchy) —
-    aggregate counts and top experts per skill.
+    """Get the proficiency distribution for several skills at once — same as
+    get_skill_coverage, returned as a JSON array in the order given.
 
     Args:
-        org_unit_id: Org unit ID (e.g. ORG030, ORG031B)
-        limit: Number of top skills to return 1-100 (default 20)
+        skill_ids: Comma-separated numeric skill IDs (e.g. "1,42,7") — max 10
+        min_proficiency: Threshold for the coverage count 0-5 (default 3)
     """
-    return await _api_get(
-        f"/tm/orgs/{org_unit_id}/skills/summary",
-        params={"limit": int(limit)},
+    path = _API_PATHS["get_skill_coverage"]
+    params = {"min_proficiency": min_proficiency}
+    return await _api_get_many(
+        [(path.format(skill_id=sid), params) for sid in _parse_skill_ids(skill_ids)]
     )
 
 
 @mcp.tool()
 @audited
-async def get_org_skill_experts(
-    org_unit_id: str,
-    skill_id: float,
-    min_proficiency: float = 3,
-    limit: float = 20,
+async def get_stale_skills_batch(
+    skill_ids: str,
+    older_than_days: _Days = 365,
     ctx: Context = None,
 ) -> str:
-    """Find employees within an org unit who have a specific skill — scoped to the
-    org hierarchy (includes child orgs).
+    """Find stale skill records for several skills at once — same as get_stale_skills,
+    returned as a JSON array in the order given.
 
     Args:
-        org_unit_id: Org unit ID (e.g. ORG030, ORG031B)
-        skill_id: Numeric skill ID
-        min_proficiency: Minimum proficiency level 0-5 (default 3)
-        limit: Max results 1-100 (default 20)
+        skill_ids: Comma-separated numeric skill IDs (e.g. "1,42,7") — max 10
+        older_than_days: Skills not updated in this many days (default 365)
+    """
+    path = _API_PATHS["get_stale_skills"]
+    params = {"older_than_days": older_than_days}
+    return await _api_get_many(
+        [(path.format(skill_id=sid), params) for sid in _parse_skill_ids(skill_ids)]
+    )
+
+
+@mcp.tool()
+@audited
+async def get_skill_evidence_batch(
+    employee_id: _EmployeeId,
+    skill_ids: str,
+    ctx: Context = None,
+) -> str:
+    """Get the evidence behind several of an employee's skill ratings at once — same as
+    get_skill_evidence, returned as a JSON array in the order given.
+
+    Args:
+        employee_id: Employee ID (e.g. EMP000001)
+        skill_ids: Comma-separated numeric skill IDs (e.g. "1,42,7") — max 10
     """
-    return await _api_get(
-        f"/tm/orgs/{org_unit_id}/skills/{int(skill_id)}/experts",
-        params={"min_proficiency": int(min_proficiency), "limit": int(limit)},
+    path = _API_PATHS["get_skill_evidence"]
+    return await _api_get_many(
+        [
+            (path.format(employee_id=employee_id, skill_id=sid), None)
+            for sid in _parse_skill_ids(skill_ids)
+        ]
     )
 
 
@@ -436,14 +791,15 @@ async def get_org_skill_experts(
 
 
 @mcp.tool()
-async def audit_get_recent_calls(limit: float = 50) -> str:
-    """Get the most recent MCP tool invocations from the audit log.
+async def audit_get_recent_calls(limit: Annotated[int, Field(ge=1, le=500)] = 50) -> str:
+    """Get the most recent MCP tool invocations from the audit log (summary columns —
+    use audit_get_call for a call's parameters and error message).
 
     Args:
         limit: Number of recent calls to return (1-500, default 50)
     """
-    rows = await audit_logger.query_recent(limit=int(limit))
-    return json.dumps(rows, indent=2)
+    rows = await audit_logger.query_recent(limit=limit)
+    return dumps(rows, pretty=True)
 
 
 @mcp.tool()
@@ -454,16 +810,18 @@ async def audit_query_calls(
     since: str | None = None,
     until: str | None = None,
     errors_only: bool = False,
-    limit: float = 100,
+    limit: Annotated[int, Field(ge=1, le=500)] = 100,
 ) -> str:
     """Query the audit log with filters — find calls by tool, session, client, or time range.
+    Returns summary columns; use audit_get_call for a call's full details.
 
     Args:
         tool_name: Filter by tool name (e.g. "get_employee_skills")
         session_id: Filter by MCP session ID
         client_name: Filter by client name from MCP handshake
-        since: Start of time range (ISO 8601, e.g. "2026-02-01")
-        until: End of time range (ISO 8601, e.g. "2026-02-28")
+        since: Start of time range (ISO 8601 date or datetime, UTC unless an offset
+            is given, e.g. "2026-02-01" or "2026-02-01T09:30:00Z")
+        until: End of time range (same format, e.g. "2026-02-28")
         errors_only: If true, only return failed calls
         limit: Max results to return (1-500, default 100)
     """
@@ -474,9 +832,23 @@ async def audit_query_calls(
         since=since,
         until=until,
         errors_only=errors_only,
-        limit=int(limit),
+        limit=limit,
     )
-    return json.dumps(rows, indent=2)
+    return dumps(rows, pretty=True)
+
+
+@mcp.tool()
+async def audit_get_call(call_id: Annotated[int, Field(ge=1)]) -> str:
+    """Get the full audit record for one tool call — parameters, error message, and
+    request/client details. Use the id from audit_get_recent_calls or audit_query_calls.
+
+    Args:
+        call_id: Audit record id
+    """
+    row = await audit_logger.get_call(call_id)
+    if row is None:
+        raise ValueError(f"No audit record with id {call_id}")
+    return dumps(row, pretty=True)
 
 
 @mcp.tool()
@@ -485,7 +857,7 @@ async def audit_get_summary() -> str:
     and per-tool duration averages.
     """
     stats = await audit_logger.get_summary_stats()
-    return json.dumps(stats, indent=2)
+    return dumps(stats, pretty=True)
 
 
 # ===========================================================================
@@ -494,30 +866,79 @@ async def audit_get_summary() -> str:
 
 
 @mcp.custom_route("/audit/recent", methods=["GET"])
-async def audit_recent_http(request: Request) -> JSONResponse:
+async def audit_recent_http(request: Request) -> ORJSONResponse:
     limit = int(request.query_params.get("limit", "50"))
     rows = await audit_logger.query_recent(limit=limit)
-    return JSONResponse(rows)
+    return ORJSONResponse(rows)
+
+
+def _query_filters(request: Request) -> dict:
+    """Filters for the /audit/query routes, read from the query string."""
+    return {
+        "tool_name": request.query_params.get("tool_name"),
+        "session_id": request.query_params.get("session_id"),
+        "client_name": request.query_params.get("client_name"),
+        "since": request.query_params.get("since"),
+        "until": request.query_params.get("until"),
+        "errors_only": request.query_params.get("errors_only", "").lower() == "true",
+        "limit": int(request.query_params.get("limit", "100")),
+    }
 
 
 @mcp.custom_route("/audit/query", methods=["GET"])
-async def audit_query_http(request: Request) -> JSONResponse:
-    rows = await audit_logger.query_with_filters(
-        tool_name=request.query_params.get("tool_name"),
-        session_id=request.query_params.get("session_id"),
-        client_name=request.query_params.get("client_name"),
-        since=request.query_params.get("since"),
-        until=request.query_params.get("until"),
-        errors_only=request.query_params.get("errors_only", "").lower() == "true",
-        limit=int(request.query_params.get("limit", "100")),
+async def audit_query_http(request: Request) -> ORJSONResponse:
+    try:
+        rows = await audit_logger.query_with_filters(**_query_filters(request))
+    except ValueError as exc:  # malformed since/until/limit
+        return ORJSONResponse({"detail": str(exc)}, status_code=400)
+    return ORJSONResponse(rows)
+
+
+async def _ndjson(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Encode rows as newline-delimited JSON, one line per row as it is read."""
+    async for row in rows:
+        yield dumps_bytes(row) + b"\n"
+
+
+@mcp.custom_route("/audit/recent.ndjson", methods=["GET"])
+async def audit_recent_ndjson_http(request: Request) -> StreamingResponse:
+    limit = int(request.query_params.get("limit", "50"))
+    return StreamingResponse(
+        _ndjson(audit_logger.iter_recent(limit=limit)), media_type="application/x-ndjson"
     )
-    return JSONResponse(rows)
+
+
+@mcp.custom_route("/audit/query.ndjson", methods=["GET"])
+async def audit_query_ndjson_http(request: Request) -> StreamingResponse | ORJSONResponse:
+    try:
+        rows = audit_logger.iter_with_filters(**_query_filters(request))
+    except ValueError as exc:  # malformed since/until/limit
+        return ORJSONResponse({"detail": str(exc)}, status_code=400)
+    return StreamingResponse(_ndjson(rows), media_type="application/x-ndjson")
+
+
+@mcp.custom_route("/audit/calls/{call_id:int}", methods=["GET"])
+async def audit_call_http(request: Request) -> ORJSONResponse:
+    row = await audit_logger.get_call(request.path_params["call_id"])
+    if row is None:
+        return ORJSONResponse({"detail": "Not found"}, status_code=404)
+    return ORJSONResponse(row)
 
 
 @mcp.custom_route("/audit/summary", methods=["GET"])
-async def audit_summary_http(request: Request) -> JSONResponse:
+async def audit_summary_http(request: Request) -> ORJSONResponse:
     stats = await audit_logger.get_summary_stats()
-    return JSONResponse(stats)
+    return ORJSONResponse(stats)
+
+
+# ===========================================================================
+# CACHE ADMIN REST ENDPOINTS — inspect and reset the TM API response cache
+# ===========================================================================
+
+
+@mcp.custom_route("/cache/stats", methods=["GET"])
+async def cache_stats_http(request: Request) -> ORJSONResponse:
+    return ORJSONResponse(response_cache.stats())
 
 
 # ===========================================================================
@@ -571,8 +992,9 @@ def org_talent_review(org_unit_id: str) -> str:
         f"Please perform a talent review for org unit {org_unit_id}.\n\n"
         f"Steps:\n"
         f"1. Use get_org_skill_summary to see the top skills in this org\n"
-        f"2. For the top 3 skills, use get_skill_coverage to understand the depth\n"
-        f"3. For the top 3 skills, check get_stale_skills to find outdated records\n"
+        f"2. For the top 3 skills, use get_skill_coverage_batch (one call, comma-separated "
+        f"skill IDs) to understand the depth\n"
+        f"3. For the same skills, use get_stale_skills_batch to find outdated records\n"
         f"4. Summarize: what this org is strong in, where the gaps might be, "
         f"and any governance concerns (stale skills needing revalidation)"
     )
@@ -585,12 +1007,30 @@ def org_talent_review(org_unit_id: str) -> str:
 if __name__ == "__main__":
     import uvicorn
     from starlette.middleware.cors import CORSMiddleware
+    from starlette.middleware.gzip import GZipMiddleware
+
+    # Browsers send origins lowercase with no trailing slash — normalize the configured
+    # list to match, dropping blanks and duplicates
+    cors_origins = list(
+        dict.fromkeys(
+            o.strip().rstrip("/").lower() for o in settings.cors_origins.split(",") if o.strip()
+        )
+    )
 
     app = mcp.streamable_http_app()
+    app.router.lifespan_context = app_lifespan
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors_origins.split(","),
+        allow_origins=cors_origins,
         allow_methods=["GET", "POST"],
         allow_headers=["*"],
+        max_age=86400,  # let browsers cache preflight responses for a day
     )
-    uvicorn.run(app, host=settings.host, port=settings.port)
+    # Compresses large JSON bodies (MCP JSON responses, audit REST); Starlette skips
+    # text/event-stream, so SSE streams are never buffered
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+    # uvloop and httptools are pinned explicitly so a missing package fails at startup
+    # instead of silently falling back to asyncio / h11.
+    # One worker on purpose: MCP sessions, the response cache and the audit writer are
+    # per-process state, so extra workers would scatter a session's requests across them.
+    uvicorn.run(app, host=settings.host, port=settings.port, loop="uvloop", http="httptools")